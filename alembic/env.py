@@ -5,6 +5,7 @@ from sqlalchemy import pool
 
 from alembic import context
 from models import Base
+from migration_helpers import CHECKPOINT_TABLE
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -27,6 +28,15 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def include_name(name, type_, parent_names):
+    """Keep autogenerate from proposing to drop the backfill checkpoint table."""
+    return not (type_ == "table" and name == CHECKPOINT_TABLE)
+
+
+def is_sqlite(url) -> bool:
+    return str(url).startswith("sqlite")
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -45,6 +55,10 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
+        # SQLite cannot ALTER most column properties; emit table rebuilds.
+        render_as_batch=is_sqlite(url),
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
@@ -66,7 +80,14 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+            # SQLite cannot ALTER most column properties; emit table rebuilds.
+            render_as_batch=is_sqlite(connection.engine.url),
+            # Commit after each revision so long migrations do not share
+            # one transaction and chunked backfills can commit as they go.
+            transaction_per_migration=True,
         )
 
         with context.begin_transaction():
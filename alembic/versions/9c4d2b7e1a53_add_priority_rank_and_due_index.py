@@ -0,0 +1,41 @@
+"""Add priority rank and due index
+
+Revision ID: 9c4d2b7e1a53
+Revises: 6e19a396afdf
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4d2b7e1a53'
+down_revision: Union[str, None] = '6e19a396afdf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('priority_rank', sa.Integer(), nullable=True))
+    # Backfill with the same mapping as models.priority_rank()
+    op.execute(
+        "UPDATE projects SET priority_rank = CASE lower(trim(priority)) "
+        "WHEN 'high' THEN 1 WHEN 'medium' THEN 2 WHEN 'low' THEN 3 ELSE 4 END"
+    )
+    op.create_index(
+        'ix_projects_due', 'projects', ['deadline', 'priority_rank'], unique=False,
+        sqlite_where=sa.text("status != 'Completed' AND deadline IS NOT NULL"),
+    )
+    op.create_index(op.f('ix_tasks_project_id'), 'tasks', ['project_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tasks_project_id'), table_name='tasks')
+    op.drop_index('ix_projects_due', table_name='projects')
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.drop_column('priority_rank')
@@ -0,0 +1,51 @@
+"""Store payment amounts as integer cents
+
+Revision ID: b71f0e8d3c26
+Revises: 9c4d2b7e1a53
+Create Date: 2026-10-19 11:40:02.551870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import backfill, column_exists
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71f0e8d3c26'
+down_revision: Union[str, None] = '9c4d2b7e1a53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Guarded so an interrupted backfill can be resumed by re-running upgrade
+    if not column_exists('payments', 'amount_cents'):
+        op.add_column('payments', sa.Column('amount_cents', sa.Integer(), nullable=True))
+    if not column_exists('payments', 'currency'):
+        op.add_column('payments', sa.Column('currency', sa.String(length=3), nullable=True))
+    backfill(
+        'payments', "amount_cents = CAST(round(amount * 100) AS INTEGER), currency = 'USD'",
+        name='b71f0e8d3c26_amount_cents',
+    )
+    with op.batch_alter_table('payments') as batch_op:
+        batch_op.alter_column('amount_cents', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('currency', existing_type=sa.String(length=3), nullable=False)
+        batch_op.drop_column('amount')
+    op.create_index('ix_payments_totals', 'payments',
+                    ['project_id', 'currency', 'payment_type', 'amount_cents'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_payments_totals', table_name='payments', if_exists=True)
+    if not column_exists('payments', 'amount'):
+        op.add_column('payments', sa.Column('amount', sa.Float(), nullable=True))
+    backfill('payments', "amount = amount_cents / 100.0", name='b71f0e8d3c26_amount_downgrade')
+    with op.batch_alter_table('payments') as batch_op:
+        batch_op.alter_column('amount', existing_type=sa.Float(), nullable=False)
+        batch_op.drop_column('currency')
+        batch_op.drop_column('amount_cents')
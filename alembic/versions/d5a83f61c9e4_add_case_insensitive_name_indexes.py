@@ -0,0 +1,30 @@
+"""Add case-insensitive name indexes
+
+Revision ID: d5a83f61c9e4
+Revises: b71f0e8d3c26
+Create Date: 2026-10-19 15:27:31.904412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a83f61c9e4'
+down_revision: Union[str, None] = 'b71f0e8d3c26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_clients_name_lower', 'clients', [sa.text('lower(name)')], unique=False)
+    op.create_index('ix_projects_name_lower', 'projects', [sa.text('lower(name)')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_projects_name_lower', table_name='projects')
+    op.drop_index('ix_clients_name_lower', table_name='clients')
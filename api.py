@@ -0,0 +1,380 @@
+# api.py
+"""
+Local JSON API over the tracker's operations, started with `cli.py serve`.
+
+Requests are served by a fixed pool of worker threads; each request opens a
+session from SessionLocal, so connections come from the shared engine pool
+instead of being created per call.
+
+Endpoints (query parameters for GET, JSON body for POST):
+    GET  /clients                 POST /clients   {name, contact_person, email, phone}
+    GET  /projects?client_id=     POST /projects  {client_id, name, description, deadline, priority}
+    GET  /projects/due?limit=&within=
+    GET  /tasks?project_id=       POST /tasks     {project_id, description}
+    GET  /payments?project_id=    POST /payments  {project_id, amount, currency, type, notes}
+    GET  /progress?project_id=
+    GET  /search?q=
+    GET  /balances?project_id=
+
+Wherever client_id / project_id is accepted, `client` / `project` may give
+the name instead (resolved case-insensitively, see lookup.py).
+"""
+import json
+import os
+import socketserver
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from database import SessionLocal
+from lookup import resolve_client_id, resolve_project_id, NameNotFound, AmbiguousName
+from models import Client, Project, Task, Payment, DEFAULT_CURRENCY, to_cents, from_cents, normalize_currency
+from queries import (
+    fetch_clients, fetch_projects, fetch_due_projects, fetch_tasks,
+    fetch_payments, fetch_payment_totals, parse_window,
+)
+
+PAYMENT_TYPES = ('Invoice', 'Received', 'Pending')
+DEFAULT_DUE_LIMIT = 10
+MAX_DUE_LIMIT = 1000
+
+
+class ApiError(Exception):
+    """Raised by handlers to return an error status with a JSON message."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# --- Serialization ---
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _project(row):
+    data = row._asdict()
+    data['progress'] = round(row.progress, 2)
+    return data
+
+def _due_project(row, now):
+    data = row._asdict()
+    data['overdue'] = row.is_overdue(now)
+    return data
+
+def _payment(row):
+    data = row._asdict()
+    data['amount'] = row.amount
+    return data
+
+def _total(row):
+    data = row._asdict()
+    data['total'] = from_cents(row.total_cents)
+    return data
+
+
+# --- Parameter parsing ---
+def _int(value, name, required=False):
+    if value in (None, ''):
+        if required:
+            raise ApiError(400, f"'{name}' is required.")
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"'{name}' must be an integer.")
+
+def _text(body, name, required=False, default=''):
+    value = body.get(name, default)
+    if value is None:
+        value = default
+    if not isinstance(value, str):
+        raise ApiError(400, f"'{name}' must be a string.")
+    if required and not value.strip():
+        raise ApiError(400, f"'{name}' is required.")
+    return value
+
+def _entity_id(db, params, id_key, name_key, resolver, required=False):
+    name = params.get(name_key)
+    if name is None:
+        return _int(params.get(id_key), id_key, required=required)
+    if not isinstance(name, str):
+        raise ApiError(400, f"'{name_key}' must be a string.")
+    if params.get(id_key) not in (None, ''):
+        raise ApiError(400, f"Use either '{id_key}' or '{name_key}', not both.")
+    try:
+        return resolver(db, name)
+    except NameNotFound as e:
+        raise ApiError(404, str(e))
+    except AmbiguousName as e:
+        raise ApiError(409, str(e))
+
+def _client_id(db, params, required=False):
+    return _entity_id(db, params, 'client_id', 'client', resolve_client_id, required)
+
+def _project_id(db, params, required=False):
+    return _entity_id(db, params, 'project_id', 'project', resolve_project_id, required)
+
+def _window(value):
+    try:
+        return parse_window(value)
+    except ValueError:
+        raise ApiError(400, "'within' must be a number followed by h, d or w (e.g. 7d).")
+
+
+# --- Handlers: each takes (db, query, body) and returns (status, payload) ---
+def list_clients(db, query, body):
+    return 200, [c._asdict() for c in fetch_clients(db)]
+
+def add_client(db, query, body):
+    name = _text(body, 'name', required=True)
+    if db.query(Client.id).filter_by(name=name).first():
+        raise ApiError(409, f"Client '{name}' already exists.")
+    client = Client(
+        name=name,
+        contact_person=_text(body, 'contact_person'),
+        email=_text(body, 'email'),
+        phone=_text(body, 'phone'),
+    )
+    db.add(client)
+    db.commit()
+    return 201, {'id': client.id, 'name': client.name}
+
+def list_projects(db, query, body):
+    client_id = _client_id(db, query)
+    return 200, [_project(p) for p in fetch_projects(db, client_id=client_id)]
+
+def add_project(db, query, body):
+    client_id = _client_id(db, body, required=True)
+    if not db.get(Client, client_id):
+        raise ApiError(404, f"Client with ID {client_id} not found.")
+    deadline = _text(body, 'deadline').strip()
+    try:
+        deadline = datetime.strptime(deadline.split()[0], '%Y-%m-%d') if deadline else None
+    except ValueError:
+        raise ApiError(400, "'deadline' must be in YYYY-MM-DD format.")
+    project = Project(
+        name=_text(body, 'name', required=True),
+        description=_text(body, 'description'),
+        deadline=deadline,
+        priority=_text(body, 'priority', default='Medium'),
+        client_id=client_id,
+    )
+    db.add(project)
+    db.commit()
+    return 201, {'id': project.id, 'name': project.name}
+
+def due_projects(db, query, body):
+    limit = _int(query.get('limit'), 'limit')
+    if limit is None:
+        limit = DEFAULT_DUE_LIMIT
+    elif not 1 <= limit <= MAX_DUE_LIMIT:
+        raise ApiError(400, f"'limit' must be between 1 and {MAX_DUE_LIMIT}.")
+    within = _window(query.get('within'))
+    now = datetime.now()
+    rows = fetch_due_projects(db, limit=limit, due_before=now + within if within else None)
+    return 200, [_due_project(p, now) for p in rows]
+
+def list_tasks(db, query, body):
+    project_id = _project_id(db, query)
+    return 200, [t._asdict() for t in fetch_tasks(db, project_id=project_id)]
+
+def add_task(db, query, body):
+    project_id = _project_id(db, body, required=True)
+    if not db.get(Project, project_id):
+        raise ApiError(404, f"Project with ID {project_id} not found.")
+    task = Task(description=_text(body, 'description', required=True), project_id=project_id)
+    db.add(task)
+    db.commit()
+    return 201, {'id': task.id, 'project_id': project_id}
+
+def list_payments(db, query, body):
+    project_id = _project_id(db, query)
+    return 200, [_payment(p) for p in fetch_payments(db, project_id=project_id)]
+
+def add_payment(db, query, body):
+    project_id = _project_id(db, body, required=True)
+    if not db.get(Project, project_id):
+        raise ApiError(404, f"Project with ID {project_id} not found.")
+    try:
+        amount_cents = to_cents(body.get('amount'))
+    except (ArithmeticError, ValueError):
+        raise ApiError(400, "'amount' must be a number such as 12.50.")
+    try:
+        currency = normalize_currency(_text(body, 'currency', default=DEFAULT_CURRENCY))
+    except ValueError:
+        raise ApiError(400, "'currency' must be a three-letter code such as USD.")
+    payment_type = _text(body, 'type', required=True)
+    if payment_type not in PAYMENT_TYPES:
+        raise ApiError(400, f"'type' must be one of {', '.join(PAYMENT_TYPES)}.")
+    payment = Payment(
+        project_id=project_id,
+        amount_cents=amount_cents,
+        currency=currency,
+        payment_type=payment_type,
+        notes=_text(body, 'notes'),
+    )
+    db.add(payment)
+    db.commit()
+    return 201, {'id': payment.id, 'amount_cents': payment.amount_cents, 'currency': payment.currency}
+
+def progress(db, query, body):
+    project_id = _project_id(db, query)
+    projects = fetch_projects(db, project_id=project_id)
+    return 200, [
+        {'id': p.id, 'name': p.name, 'client_name': p.client_name, 'progress': round(p.progress, 2),
+         'total_tasks': p.total_tasks, 'completed_tasks': p.completed_tasks}
+        for p in projects
+    ]
+
+def search(db, query, body):
+    term = query.get('q')
+    if not term:
+        raise ApiError(400, "'q' is required.")
+    pattern = f"%{term}%"
+    return 200, {
+        'clients': [c._asdict() for c in fetch_clients(db, search_term=pattern)],
+        'projects': [_project(p) for p in fetch_projects(db, search_term=pattern)],
+        'tasks': [t._asdict() for t in fetch_tasks(db, search_term=pattern)],
+        'payments': [_payment(p) for p in fetch_payments(db, search_term=pattern)],
+    }
+
+def balances(db, query, body):
+    project_id = _project_id(db, query)
+    return 200, [_total(t) for t in fetch_payment_totals(db, project_id=project_id)]
+
+
+ROUTES = {
+    ('GET', '/clients'): list_clients,
+    ('POST', '/clients'): add_client,
+    ('GET', '/projects'): list_projects,
+    ('POST', '/projects'): add_project,
+    ('GET', '/projects/due'): due_projects,
+    ('GET', '/tasks'): list_tasks,
+    ('POST', '/tasks'): add_task,
+    ('GET', '/payments'): list_payments,
+    ('POST', '/payments'): add_payment,
+    ('GET', '/progress'): progress,
+    ('GET', '/search'): search,
+    ('GET', '/balances'): balances,
+}
+
+
+def dispatch(method, target, raw_body=b''):
+    """Routes one request and returns (status, payload); used by the HTTP handler."""
+    url = urlsplit(target)
+    path = url.path.rstrip('/') or '/'
+    handler = ROUTES.get((method, path))
+    if handler is None:
+        if any(p == path for _, p in ROUTES):
+            return 405, {'error': f"Method {method} not allowed for {path}."}
+        return 404, {'error': f"No such endpoint: {path}"}
+
+    query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+    try:
+        body = json.loads(raw_body) if raw_body else {}
+    except ValueError:
+        return 400, {'error': "Request body must be valid JSON."}
+    if not isinstance(body, dict):
+        return 400, {'error': "Request body must be a JSON object."}
+
+    db = SessionLocal()
+    try:
+        return handler(db, query, body)
+    except ApiError as e:
+        db.rollback()
+        return e.status, {'error': e.message}
+    except SQLAlchemyError as e:
+        db.rollback()
+        return 500, {'error': f"Database error: {e.__class__.__name__}"}
+    except Exception as e:
+        # Never drop the connection without a reply; keep the trace on stderr
+        db.rollback()
+        traceback.print_exc()
+        return 500, {'error': f"Internal error: {e.__class__.__name__}"}
+    finally:
+        db.close()
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    server_version = "FreelanceTracker/1.0"
+
+    def _respond(self):
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            status, payload = 400, {'error': "Content-Length must be a non-negative integer."}
+            self.close_connection = True  # The body cannot be skipped reliably
+        else:
+            status, payload = dispatch(self.command, self.path, self.rfile.read(length))
+        data = json.dumps(payload, default=_default).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def address_string(self):
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.log_requests:
+            super().log_message(format, *args)
+
+
+class WorkerPoolMixIn:
+    """Hands each accepted connection to a fixed-size thread pool."""
+
+    workers = 8
+    log_requests = False
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def serve_forever(self, poll_interval=0.5):
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='api-worker') as self.executor:
+            super().serve_forever(poll_interval)
+
+
+class PooledHTTPServer(WorkerPoolMixIn, HTTPServer):
+    request_queue_size = 128
+
+
+class PooledUnixHTTPServer(WorkerPoolMixIn, socketserver.UnixStreamServer):
+    request_queue_size = 128
+
+
+def make_server(host='127.0.0.1', port=8765, socket_path=None, workers=8, log_requests=False):
+    """Builds a TCP server, or a Unix socket server when socket_path is given."""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # Stale socket from a previous run
+        server = PooledUnixHTTPServer(socket_path, RequestHandler)
+    else:
+        server = PooledHTTPServer((host, port), RequestHandler)
+    server.workers = workers
+    server.log_requests = log_requests
+    return server
@@ -0,0 +1,128 @@
+# benchmarks/bench_api_server.py
+"""
+Load-tests `cli.py serve` against spawning `cli.py` once per call.
+
+Creates a throwaway database (migrated to head and seeded), then measures
+requests/sec and latency percentiles for:
+  * spawn-per-call: `python cli.py list-projects` run as a subprocess,
+  * the JSON API:   GET /projects over HTTP from concurrent client threads.
+
+Usage:
+    python benchmarks/bench_api_server.py --requests 2000 --concurrency 8
+"""
+import argparse
+import http.client
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from alembic import command
+from alembic.config import Config
+
+CLI = os.path.join(ROOT, 'cli.py')
+
+
+def prepare_database(workdir, n_projects):
+    db_path = os.path.join(workdir, 'freelance_tracker.db')  # Same relative name database.py uses
+    config = Config(os.path.join(ROOT, 'alembic.ini'))
+    config.set_main_option('sqlalchemy.url', f"sqlite:///{db_path}")
+    command.upgrade(config, 'head')
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO clients (id, name) VALUES (1, 'Bench Client')")
+    conn.executemany(
+        "INSERT INTO projects (id, name, description, priority, priority_rank, status, client_id) "
+        "VALUES (?, ?, '', 'Medium', 2, 'Pending', 1)",
+        ((i, f"Project {i}") for i in range(1, n_projects + 1)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def percentile(latencies, pct):
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(label, latencies, elapsed):
+    print(f"{label:<16} {len(latencies) / elapsed:9.1f} req/s   "
+          f"p50 {percentile(latencies, 50) * 1000:8.2f} ms   p99 {percentile(latencies, 99) * 1000:8.2f} ms")
+
+
+def run_load(n_requests, concurrency, call):
+    """Runs `call` n_requests times across `concurrency` threads; returns latencies and wall time."""
+    latencies = []
+    lock = threading.Lock()
+
+    def one(_):
+        start = time.perf_counter()
+        call()
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(n_requests)))
+    return latencies, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000, help='Requests sent to the API server.')
+    parser.add_argument('--spawn-requests', type=int, default=40, help='Subprocess calls for the baseline.')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--projects', type=int, default=50)
+    parser.add_argument('--port', type=int, default=8766)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prepare_database(tmp, args.projects)
+
+        def spawn():
+            subprocess.run([sys.executable, CLI, 'list-projects'], cwd=tmp, check=True,
+                           stdout=subprocess.DEVNULL)
+
+        latencies, elapsed = run_load(args.spawn_requests, args.concurrency, spawn)
+        report("spawn-per-call", latencies, elapsed)
+
+        server = subprocess.Popen(
+            [sys.executable, CLI, 'serve', '--port', str(args.port)],
+            cwd=tmp, stdout=subprocess.DEVNULL,
+        )
+        try:
+            def api_call(path='/projects', timeout=10):
+                conn = http.client.HTTPConnection('127.0.0.1', args.port, timeout=timeout)
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                conn.close()
+                if response.status != 200:
+                    raise RuntimeError(f"HTTP {response.status}")
+
+            deadline = time.time() + 10
+            while True:
+                try:
+                    api_call('/clients', timeout=1)
+                    break
+                except OSError:
+                    if time.time() > deadline:
+                        raise
+                    time.sleep(0.05)
+
+            latencies, elapsed = run_load(args.requests, args.concurrency, api_call)
+            report("JSON API", latencies, elapsed)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
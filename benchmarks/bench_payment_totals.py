@@ -0,0 +1,94 @@
+# benchmarks/bench_payment_totals.py
+"""
+Compares payment totals summed in Python against integer SUM() in SQLite.
+
+Generates a throwaway SQLite database with random cent amounts, then times:
+  * the old approach: fetch every amount as a float and re-sum with Decimal,
+  * exact SQL aggregation over amount_cents (fetch_payment_totals).
+
+Usage:
+    python benchmarks/bench_payment_totals.py --payments 2000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Client, Project, Payment, from_cents
+from queries import fetch_payment_totals
+
+BATCH_SIZE = 100000
+
+
+def populate(engine, n_payments, n_projects):
+    """Bulk-inserts generated payments in batches."""
+    now = datetime.now()
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(insert(Client), [{"id": 1, "name": "Bench Client"}])
+        conn.execute(insert(Project), [
+            {"id": i, "name": f"Project {i}", "client_id": 1} for i in range(1, n_projects + 1)
+        ])
+        for start in range(0, n_payments, BATCH_SIZE):
+            conn.execute(insert(Payment), [
+                {"amount_cents": rng.randint(1, 500000), "currency": "USD",
+                 "payment_type": rng.choice(["Invoice", "Received", "Pending"]),
+                 "date": now, "notes": "", "project_id": rng.randint(1, n_projects)}
+                for _ in range(start, min(start + BATCH_SIZE, n_payments))
+            ])
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--payments', type=int, default=2000000)
+    parser.add_argument('--projects', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        populate(engine, args.payments, args.projects)
+        db = sessionmaker(bind=engine)()
+
+        def python_decimal_sum():
+            # Mirrors the old Float column: amounts arrive as floats and are
+            # re-summed row by row in Python.
+            amounts = db.execute(select(Payment.amount_cents / 100.0)).scalars()
+            return sum((Decimal(repr(a)) for a in amounts), Decimal('0'))
+
+        def python_float_sum():
+            return sum(db.execute(select(Payment.amount_cents / 100.0)).scalars())
+
+        def sql_integer_sum():
+            return from_cents(sum(t.total_cents for t in fetch_payment_totals(db)))
+
+        decimal_total, decimal_time = timed(python_decimal_sum)
+        float_total, float_time = timed(python_float_sum)
+        sql_total, sql_time = timed(sql_integer_sum)
+
+        print(f"{args.payments} payments")
+        print(f"Python Decimal sum  {decimal_time:8.3f} s  total {decimal_total}")
+        print(f"Python float sum    {float_time:8.3f} s  total {float_total!r}")
+        print(f"SQLite integer SUM  {sql_time:8.3f} s  total {sql_total}")
+        print(f"speedup vs Decimal x{decimal_time / sql_time:.1f}")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/bench_read_rows.py
+"""
+Compares the ORM read path against the column-only row records in queries.py.
+
+Generates a throwaway SQLite database, then measures wall time and peak
+Python memory (tracemalloc) for loading every project with its client name
+and progress, and every payment with its project name.
+
+Usage:
+    python benchmarks/bench_read_rows.py --projects 20000 --tasks-per-project 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Client, Project, Task, Payment
+from queries import fetch_projects, fetch_payments
+
+
+def populate(engine, n_clients, n_projects, tasks_per_project):
+    """Bulk-inserts generated rows with Core inserts."""
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(insert(Client), [
+            {"id": i, "name": f"Client {i}", "contact_person": "N/A", "email": f"c{i}@example.com", "phone": "555"}
+            for i in range(1, n_clients + 1)
+        ])
+        conn.execute(insert(Project), [
+            {"id": i, "name": f"Project {i}", "description": "Generated project", "deadline": now,
+             "priority": "Medium", "status": "Pending", "client_id": (i % n_clients) + 1}
+            for i in range(1, n_projects + 1)
+        ])
+        conn.execute(insert(Task), [
+            {"description": f"Task {j}", "is_completed": j % 2 == 0, "created_at": now, "project_id": i}
+            for i in range(1, n_projects + 1) for j in range(tasks_per_project)
+        ])
+        conn.execute(insert(Payment), [
+            {"amount_cents": 10000, "currency": "USD", "payment_type": "Received", "date": now,
+             "notes": "", "project_id": i}
+            for i in range(1, n_projects + 1)
+        ])
+
+
+def orm_path(db):
+    rows = []
+    for p in db.query(Project).all():
+        rows.append((p.id, p.name, p.client.name if p.client else 'N/A', p.get_progress_percentage()))
+    for p in db.query(Payment).all():
+        rows.append((p.id, p.project.name if p.project else 'N/A', p.amount))
+    return rows
+
+
+def row_path(db):
+    rows = []
+    for p in fetch_projects(db):
+        rows.append((p.id, p.name, p.client_name or 'N/A', p.progress))
+    for p in fetch_payments(db):
+        rows.append((p.id, p.project_name or 'N/A', p.amount))
+    return rows
+
+
+def measure(label, fn, Session):
+    db = Session()
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = fn(db)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    print(f"{label:<12} {elapsed:8.3f} s  peak {peak / 1024 / 1024:8.1f} MiB  "
+          f"{peak / len(rows):8.0f} B/row  ({len(rows)} rows)")
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--projects', type=int, default=20000)
+    parser.add_argument('--tasks-per-project', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        populate(engine, args.clients, args.projects, args.tasks_per_project)
+        Session = sessionmaker(bind=engine)
+
+        orm_time, orm_peak = measure("ORM", orm_path, Session)
+        row_time, row_peak = measure("row records", row_path, Session)
+        print(f"speedup x{orm_time / row_time:.1f}, memory x{orm_peak / row_peak:.1f}")
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
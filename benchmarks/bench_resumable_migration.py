@@ -0,0 +1,112 @@
+# benchmarks/bench_resumable_migration.py
+"""
+Exercises the chunked, resumable backfill on a large generated database.
+
+Builds a throwaway SQLite database at the revision before the integer-cents
+payment migration, fills it with generated payments, then:
+  1. starts `alembic upgrade head` in a subprocess and kills it (SIGKILL)
+     once the first backfill checkpoint has been committed,
+  2. runs `alembic upgrade head` again, which resumes from the checkpoint,
+  3. verifies every row was converted exactly once and reports timings.
+
+Usage:
+    python benchmarks/bench_resumable_migration.py --payments 3000000
+"""
+import argparse
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from alembic import command
+from alembic.config import Config
+
+from migration_helpers import CHECKPOINT_TABLE
+
+BASE_REVISION = '9c4d2b7e1a53'
+BATCH_SIZE = 100000
+
+
+def alembic_config(db_path):
+    config = Config(os.path.join(ROOT, 'alembic.ini'))
+    config.set_main_option('sqlalchemy.url', f"sqlite:///{db_path}")
+    return config
+
+
+def populate(db_path, n_payments):
+    """Inserts payments whose float amount is (id % 1000000) / 100."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO clients (id, name) VALUES (1, 'Bench Client')")
+    conn.execute("INSERT INTO projects (id, name, client_id) VALUES (1, 'Bench Project', 1)")
+    for start in range(1, n_payments + 1, BATCH_SIZE):
+        ids = range(start, min(start + BATCH_SIZE, n_payments + 1))
+        conn.executemany(
+            "INSERT INTO payments (id, amount, payment_type, notes, project_id) VALUES (?, ?, 'Received', '', 1)",
+            ((i, (i % 1000000) / 100) for i in ids),
+        )
+    conn.commit()
+    conn.close()
+
+
+def checkpoint(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT max(last_id) FROM {CHECKPOINT_TABLE}").fetchone()[0]
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--payments', type=int, default=3000000)
+    parser.add_argument('--upgrade-only', metavar='DB_PATH', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.upgrade_only:
+        command.upgrade(alembic_config(args.upgrade_only), 'head')
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        command.upgrade(alembic_config(db_path), BASE_REVISION)
+        started = time.perf_counter()
+        populate(db_path, args.payments)
+        print(f"Generated {args.payments} payments in {time.perf_counter() - started:.1f}s")
+
+        # 1. Interrupted run
+        started = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, __file__, '--upgrade-only', db_path])
+        while proc.poll() is None and not checkpoint(db_path):
+            time.sleep(0.05)
+        proc.kill()
+        proc.wait()
+        interrupted_at = checkpoint(db_path)
+        print(f"Killed first run after {time.perf_counter() - started:.1f}s at checkpoint id {interrupted_at}")
+
+        # 2. Resumed run
+        started = time.perf_counter()
+        subprocess.run([sys.executable, __file__, '--upgrade-only', db_path], check=True)
+        print(f"Resumed run finished in {time.perf_counter() - started:.1f}s")
+
+        # 3. Verification
+        conn = sqlite3.connect(db_path)
+        converted, wrong = conn.execute(
+            "SELECT count(*), sum(amount_cents != id % 1000000) FROM payments"
+        ).fetchone()
+        leftover = conn.execute(f"SELECT count(*) FROM {CHECKPOINT_TABLE}").fetchone()[0]
+        version = conn.execute("SELECT version_num FROM alembic_version").fetchone()[0]
+        conn.close()
+        print(f"{converted} rows converted, {wrong} mismatched, {leftover} checkpoints left, revision {version}")
+        if wrong or leftover or converted != args.payments:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
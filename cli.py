@@ -4,13 +4,69 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 from tabulate import tabulate # For pretty tables
 import csv
+import os
 
-from database import init_db, get_db
-from models import Client, Project, Task, Payment
+from database import init_db, get_db, POOL_SIZE
+from models import Client, Project, Task, Payment, DEFAULT_CURRENCY, to_cents, format_money, normalize_currency
+from queries import fetch_clients, fetch_projects, fetch_due_projects, fetch_tasks, fetch_payments, fetch_payment_totals, parse_window
+from lookup import resolve_client_id, resolve_project_id
 
 # Initialize the database when the CLI starts
 init_db()
 
+def window_option(ctx, param, value):
+    """Click callback turning a window such as '7d', '12h' or '2w' into a timedelta."""
+    try:
+        return parse_window(value)
+    except ValueError:
+        raise click.BadParameter("use a number followed by h, d or w (e.g. 7d).")
+
+def parse_amount(ctx, param, value):
+    """Click callback turning an amount such as '12.50' into exact integer cents."""
+    try:
+        return to_cents(value)
+    except (ArithmeticError, ValueError):
+        raise click.BadParameter(f"'{value}' is not a valid amount.")
+
+def parse_currency(ctx, param, value):
+    """Click callback validating a three-letter ISO 4217 currency code."""
+    try:
+        return normalize_currency(value)
+    except ValueError:
+        raise click.BadParameter("use a three-letter currency code such as USD or EUR.")
+
+class PromptUnless(click.Option):
+    """Option that only prompts when none of the `unless` parameters were given."""
+
+    def __init__(self, *args, unless=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.unless = unless
+
+    def consume_value(self, ctx, opts):
+        if not any(opts.get(name) is not None for name in self.unless):
+            return super().consume_value(ctx, opts)
+        prompt, self.prompt = self.prompt, None
+        try:
+            return super().consume_value(ctx, opts)
+        finally:
+            self.prompt = prompt
+
+def resolve_id(db, id_value, name, resolver, id_flag, name_flag):
+    """
+    Returns the ID passed directly or the one `resolver` finds for `name`.
+    An unknown or ambiguous name aborts the command with suggestions.
+    """
+    if name is None:
+        return id_value
+    if id_value is not None:
+        db.close()
+        raise click.UsageError(f"Use either {id_flag} or {name_flag}, not both.")
+    try:
+        return resolver(db, name)
+    except LookupError as e:
+        db.close()
+        raise click.ClickException(str(e))
+
 @click.group()
 def cli():
     """
@@ -44,7 +100,7 @@ def add_client(name, contact, email, phone):
 def list_clients():
     """Lists all clients."""
     db: Session = next(get_db())
-    clients = db.query(Client).all()
+    clients = fetch_clients(db)
     if not clients:
         click.echo("No clients found.")
         return
@@ -56,14 +112,16 @@ def list_clients():
 
 # --- Project Management ---
 @cli.command()
-@click.option('--client_id', type=int, prompt='Client ID', help='ID of the client for this project.')
+@click.option('--client_id', type=int, prompt='Client ID', cls=PromptUnless, unless=['client_name'], help='ID of the client for this project.')
+@click.option('--client', 'client_name', default=None, help='Name of the client, instead of --client_id.')
 @click.option('--name', prompt='Project Name', help='Name of the project.')
 @click.option('--description', prompt='Description (optional)', default='', help='Brief description of the project.')
 @click.option('--deadline', prompt='Deadline (YYYY-MM-DD, optional)', default='', help='Project deadline date.', callback=lambda ctx, param, value: datetime.strptime(value.split()[0], '%Y-%m-%d') if value else None)
 @click.option('--priority', prompt='Enter priority (e.g., Low, Medium, High)', help='Priority of the project.')
-def add_project(client_id, name, description, deadline, priority):
+def add_project(client_id, client_name, name, description, deadline, priority):
     """Adds a new project to a client."""
     db: Session = next(get_db())
+    client_id = resolve_id(db, client_id, client_name, resolve_client_id, '--client_id', '--client')
     client = db.get(Client, client_id)
     if not client:
         click.echo(f"Error: Client with ID {client_id} not found.")
@@ -84,14 +142,12 @@ def add_project(client_id, name, description, deadline, priority):
 
 @cli.command()
 @click.option('--client_id', type=int, default=None, help='Filter projects by Client ID.')
-def list_projects(client_id):
+@click.option('--client', 'client_name', default=None, help='Filter projects by client name.')
+def list_projects(client_id, client_name):
     """Lists all projects, optionally filtered by client."""
     db: Session = next(get_db())
-    query = db.query(Project)
-    if client_id:
-        query = query.filter(Project.client_id == client_id)
-
-    projects = query.all()
+    client_id = resolve_id(db, client_id, client_name, resolve_client_id, '--client_id', '--client')
+    projects = fetch_projects(db, client_id=client_id)
     if not projects:
         click.echo("No projects found.")
         return
@@ -99,22 +155,49 @@ def list_projects(client_id):
     headers = ["ID", "Project Name", "Client", "Deadline", "Priority", "Status", "Progress"]
     table_data = []
     for p in projects:
-        progress = f"{p.get_progress_percentage():.2f}%"
+        progress = f"{p.progress:.2f}%"
         table_data.append([
-            p.id, p.name, p.client.name if p.client else 'N/A',
+            p.id, p.name, p.client_name or 'N/A',
             p.deadline.strftime('%Y-%m-%d') if p.deadline else 'N/A',
             p.priority, p.status, progress
         ])
     click.echo(tabulate(table_data, headers=headers, tablefmt="grid"))
     db.close()
 
+@cli.command()
+@click.option('--limit', type=click.IntRange(min=1), default=10, help='Number of projects to show.')
+@click.option('--within', default=None, callback=window_option, help='Only show projects due within this window (e.g. 7d, 12h, 2w). Overdue projects are always included.')
+def due(limit, within):
+    """Shows the next open projects by deadline and priority."""
+    db: Session = next(get_db())
+    now = datetime.now()
+    projects = fetch_due_projects(db, limit=limit, due_before=now + within if within else None)
+    if not projects:
+        click.echo("No upcoming projects found.")
+        db.close()
+        return
+
+    headers = ["ID", "Project Name", "Client", "Deadline", "Priority", "Status", "Remaining Tasks", "Overdue"]
+    table_data = []
+    for p in projects:
+        table_data.append([
+            p.id, p.name, p.client_name or 'N/A',
+            p.deadline.strftime('%Y-%m-%d'),
+            p.priority, p.status, p.remaining_tasks,
+            "Yes" if p.is_overdue(now) else "No"
+        ])
+    click.echo(tabulate(table_data, headers=headers, tablefmt="grid"))
+    db.close()
+
 # --- Task Tracking ---
 @cli.command()
-@click.option('--project_id', type=int, prompt='Project ID', help='ID of the project to add the task to.')
+@click.option('--project_id', type=int, prompt='Project ID', cls=PromptUnless, unless=['project_name'], help='ID of the project to add the task to.')
+@click.option('--project', 'project_name', default=None, help='Name of the project, instead of --project_id.')
 @click.option('--description', prompt='Task Description', help='Description of the task.')
-def add_task(project_id, description):
+def add_task(project_id, project_name, description):
     """Adds a new task to a project."""
     db: Session = next(get_db())
+    project_id = resolve_id(db, project_id, project_name, resolve_project_id, '--project_id', '--project')
     project = db.get(Project, project_id)
     if not project:
         click.echo(f"Error: Project with ID {project_id} not found.")
@@ -176,14 +259,12 @@ def mark_task_complete(task_id):
 
 @cli.command()
 @click.option('--project_id', type=int, default=None, help='Filter progress by Project ID.')
-def progress_report(project_id):
+@click.option('--project', 'project_name', default=None, help='Filter progress by project name.')
+def progress_report(project_id, project_name):
     """Views task completion percentage for each project, or a specific project."""
     db: Session = next(get_db())
-    query = db.query(Project)
-    if project_id:
-        query = query.filter(Project.id == project_id)
-
-    projects = query.all()
+    project_id = resolve_id(db, project_id, project_name, resolve_project_id, '--project_id', '--project')
+    projects = fetch_projects(db, project_id=project_id)
     if not projects:
         click.echo("No projects found for the given criteria.")
         return
@@ -191,29 +272,29 @@ def progress_report(project_id):
     headers = ["Project ID", "Project Name", "Client", "Progress (%)", "Total Tasks", "Completed Tasks"]
     table_data = []
     for p in projects:
-        total_tasks = len(p.tasks)
-        completed_tasks = sum(1 for task in p.tasks if task.is_completed)
-        progress = p.get_progress_percentage()
         table_data.append([
             p.id,
             p.name,
-            p.client.name if p.client else 'N/A',
-            f"{progress:.2f}",
-            total_tasks,
-            completed_tasks
+            p.client_name or 'N/A',
+            f"{p.progress:.2f}",
+            p.total_tasks,
+            p.completed_tasks
         ])
     click.echo(tabulate(table_data, headers=headers, tablefmt="grid"))
     db.close()
 
 # --- Payment Logging ---
 @cli.command()
-@click.option('--project_id', type=int, prompt='Project ID', help='ID of the project for this payment.')
-@click.option('--amount', type=float, prompt='Amount', help='Amount of the payment.')
+@click.option('--project_id', type=int, prompt='Project ID', cls=PromptUnless, unless=['project_name'], help='ID of the project for this payment.')
+@click.option('--project', 'project_name', default=None, help='Name of the project, instead of --project_id.')
+@click.option('--amount', 'amount_cents', prompt='Amount', help='Amount of the payment (e.g. 12.50).', callback=parse_amount)
+@click.option('--currency', default=DEFAULT_CURRENCY, help='ISO 4217 currency code of the payment.', callback=parse_currency)
 @click.option('--type', 'payment_type', type=click.Choice(['Invoice', 'Received', 'Pending']), prompt='Payment Type', help='Type of payment (Invoice, Received, Pending).')
 @click.option('--notes', prompt='Notes (optional)', default='', help='Any additional notes for the payment.')
-def log_payment(project_id, amount, payment_type, notes):
+def log_payment(project_id, project_name, amount_cents, currency, payment_type, notes):
     """Records a new payment for a project."""
     db: Session = next(get_db())
+    project_id = resolve_id(db, project_id, project_name, resolve_project_id, '--project_id', '--project')
     project = db.get(Project, project_id)
     if not project:
         click.echo(f"Error: Project with ID {project_id} not found.")
@@ -221,26 +302,25 @@ def log_payment(project_id, amount, payment_type, notes):
 
     payment = Payment(
         project_id=project_id,
-        amount=amount,
+        amount_cents=amount_cents,
+        currency=currency,
         payment_type=payment_type,
         notes=notes
     )
     db.add(payment)
     db.commit()
     db.refresh(payment)
-    click.echo(f"Payment of ${payment.amount:.2f} ({payment.payment_type}) logged for project '{project.name}' with ID: {payment.id}")
+    click.echo(f"Payment of {format_money(payment.amount_cents, payment.currency)} ({payment.payment_type}) logged for project '{project.name}' with ID: {payment.id}")
     db.close()
 
 @cli.command()
 @click.option('--project_id', type=int, default=None, help='Filter payments by Project ID.')
-def view_payments(project_id):
+@click.option('--project', 'project_name', default=None, help='Filter payments by project name.')
+def view_payments(project_id, project_name):
     """Views all payments, grouped by project or for a specific project."""
     db: Session = next(get_db())
-    query = db.query(Payment)
-    if project_id:
-        query = query.filter(Payment.project_id == project_id)
-
-    payments = query.all()
+    project_id = resolve_id(db, project_id, project_name, resolve_project_id, '--project_id', '--project')
+    payments = fetch_payments(db, project_id=project_id)
     if not payments:
         click.echo("No payments found.")
         return
@@ -250,13 +330,19 @@ def view_payments(project_id):
     for p in payments:
         table_data.append([
             p.id,
-            p.project.name if p.project else 'N/A',
-            f"${p.amount:.2f}",
+            p.project_name or 'N/A',
+            p.display_amount,
             p.payment_type,
             p.date.strftime('%Y-%m-%d %H:%M:%S'),
             p.notes
         ])
     click.echo(tabulate(table_data, headers=headers, tablefmt="grid"))
+
+    # Totals are summed as integer cents in SQL, so they are exact.
+    totals = fetch_payment_totals(db, project_id=project_id)
+    total_data = [[t.currency, t.payment_type, t.count, t.display_total] for t in totals]
+    click.echo("\nTotals:")
+    click.echo(tabulate(total_data, headers=["Currency", "Type", "Payments", "Total"], tablefmt="grid"))
     db.close()
 
 # --- Advanced Features ---
@@ -272,19 +358,17 @@ def export_to_csv(output_file):
             # Clients
             writer.writerow(["--- Clients ---"])
             writer.writerow(["ID", "Name", "Contact Person", "Email", "Phone"])
-            clients = db.query(Client).all()
-            for c in clients:
+            for c in fetch_clients(db):
                 writer.writerow([c.id, c.name, c.contact_person, c.email, c.phone])
             writer.writerow([]) # Blank line for separation
 
             # Projects
             writer.writerow(["--- Projects ---"])
             writer.writerow(["ID", "Project Name", "Client Name", "Description", "Deadline", "Priority", "Status", "Progress (%)"])
-            projects = db.query(Project).all()
-            for p in projects:
-                progress = f"{p.get_progress_percentage():.2f}"
+            for p in fetch_projects(db):
+                progress = f"{p.progress:.2f}"
                 writer.writerow([
-                    p.id, p.name, p.client.name if p.client else 'N/A',
+                    p.id, p.name, p.client_name or 'N/A',
                     p.description, p.deadline.strftime('%Y-%m-%d') if p.deadline else 'N/A',
                     p.priority, p.status, progress
                 ])
@@ -293,10 +377,9 @@ def export_to_csv(output_file):
             # Tasks
             writer.writerow(["--- Tasks ---"])
             writer.writerow(["ID", "Project Name", "Description", "Completed", "Created At", "Completed At"])
-            tasks = db.query(Task).all()
-            for t in tasks:
+            for t in fetch_tasks(db):
                 writer.writerow([
-                    t.id, t.project.name if t.project else 'N/A', t.description,
+                    t.id, t.project_name or 'N/A', t.description,
                     "Yes" if t.is_completed else "No",
                     t.created_at.strftime('%Y-%m-%d %H:%M:%S'),
                     t.completed_at.strftime('%Y-%m-%d %H:%M:%S') if t.completed_at else 'N/A'
@@ -305,11 +388,10 @@ def export_to_csv(output_file):
 
             # Payments
             writer.writerow(["--- Payments ---"])
-            writer.writerow(["ID", "Project Name", "Amount", "Type", "Date", "Notes"])
-            payments = db.query(Payment).all()
-            for p in payments:
+            writer.writerow(["ID", "Project Name", "Amount", "Currency", "Type", "Date", "Notes"])
+            for p in fetch_payments(db):
                 writer.writerow([
-                    p.id, p.project.name if p.project else 'N/A', f"{p.amount:.2f}",
+                    p.id, p.project_name or 'N/A', p.amount, p.currency,
                     p.payment_type, p.date.strftime('%Y-%m-%d %H:%M:%S'), p.notes
                 ])
         click.echo(f"All data exported successfully to '{output_file}'")
@@ -328,12 +410,7 @@ def search(query_string):
     click.echo(f"\n--- Search Results for '{query_string}' ---\n")
 
     # Search Clients
-    clients = db.query(Client).filter(
-        (Client.name.like(search_term)) |
-        (Client.contact_person.like(search_term)) |
-        (Client.email.like(search_term)) |
-        (Client.phone.like(search_term))
-    ).all()
+    clients = fetch_clients(db, search_term=search_term)
     if clients:
         click.echo("Clients Found:")
         headers = ["ID", "Name", "Contact Person", "Email", "Phone"]
@@ -344,36 +421,33 @@ def search(query_string):
     click.echo("-" * 40)
 
     # Search Projects
-    projects = db.query(Project).filter(
-        (Project.name.like(search_term)) |
-        (Project.description.like(search_term))
-    ).all()
+    projects = fetch_projects(db, search_term=search_term)
     if projects:
         click.echo("Projects Found:")
         headers = ["ID", "Project Name", "Client", "Description"]
-        table_data = [[p.id, p.name, p.client.name if p.client else 'N/A', p.description[:50] + '...' if len(p.description) > 50 else p.description] for p in projects]
+        table_data = [[p.id, p.name, p.client_name or 'N/A', p.description[:50] + '...' if len(p.description) > 50 else p.description] for p in projects]
         click.echo(tabulate(table_data, headers=headers, tablefmt="plain"))
     else:
         click.echo("No projects found matching the search term.")
     click.echo("-" * 40)
 
     # Search Tasks
-    tasks = db.query(Task).filter(Task.description.like(search_term)).all()
+    tasks = fetch_tasks(db, search_term=search_term)
     if tasks:
         click.echo("Tasks Found:")
         headers = ["ID", "Project Name", "Description", "Completed"]
-        table_data = [[t.id, t.project.name if t.project else 'N/A', t.description[:50] + '...' if len(t.description) > 50 else t.description, "Yes" if t.is_completed else "No"] for t in tasks]
+        table_data = [[t.id, t.project_name or 'N/A', t.description[:50] + '...' if len(t.description) > 50 else t.description, "Yes" if t.is_completed else "No"] for t in tasks]
         click.echo(tabulate(table_data, headers=headers, tablefmt="plain"))
     else:
         click.echo("No tasks found matching the search term.")
     click.echo("-" * 40)
 
     # Search Payments
-    payments = db.query(Payment).filter(Payment.notes.like(search_term)).all()
+    payments = fetch_payments(db, search_term=search_term)
     if payments:
         click.echo("Payments Found:")
         headers = ["ID", "Project Name", "Amount", "Type", "Notes"]
-        table_data = [[p.id, p.project.name if p.project else 'N/A', f"${p.amount:.2f}", p.payment_type, p.notes[:50] + '...' if len(p.notes) > 50 else p.notes] for p in payments]
+        table_data = [[p.id, p.project_name or 'N/A', p.display_amount, p.payment_type, p.notes[:50] + '...' if len(p.notes) > 50 else p.notes] for p in payments]
         click.echo(tabulate(table_data, headers=headers, tablefmt="plain"))
     else:
         click.echo("No payments found matching the search term.")
@@ -381,6 +455,32 @@ def search(query_string):
 
     db.close()
 
+# --- JSON API ---
+@cli.command()
+@click.option('--host', default='127.0.0.1', help='Interface to listen on.')
+@click.option('--port', type=int, default=8765, help='TCP port to listen on.')
+@click.option('--socket', 'socket_path', default=None, help='Listen on this Unix socket path instead of a TCP port.')
+@click.option('--workers', type=click.IntRange(min=1, max=POOL_SIZE), default=POOL_SIZE, help='Number of worker threads (at most the connection pool size).')
+@click.option('--log-requests', is_flag=True, help='Log every request to stderr.')
+def serve(host, port, socket_path, workers, log_requests):
+    """
+    Serves clients, projects, tasks, payments, progress, search and balances
+    as a local JSON API, so scripts avoid starting a new process per call.
+    """
+    from api import make_server  # Only needed by this command
+
+    server = make_server(host=host, port=port, socket_path=socket_path, workers=workers, log_requests=log_requests)
+    where = f"unix:{socket_path}" if socket_path else f"http://{host}:{port}"
+    click.echo(f"Serving JSON API on {where} with {workers} workers (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo("\nShutting down.")
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
 # --- Comprehensive Report ---
 @cli.command()
 def comprehensive_report():
@@ -389,7 +489,7 @@ def comprehensive_report():
     Presents information grouped by client and project for readability.
     """
     db: Session = next(get_db())
-    clients = db.query(Client).order_by(Client.name).all()
+    clients = fetch_clients(db, order_by_name=True)
 
     if not clients:
         click.echo("No data found in the system.")
@@ -400,6 +500,18 @@ def comprehensive_report():
     click.echo("                     COMPREHENSIVE FREELANCE PROJECT REPORT")
     click.echo("="*80 + "\n")
 
+    # Fetch each table once and group rows in memory instead of walking
+    # lazy-loaded relationships per client and per project.
+    projects_by_client = {}
+    for project in fetch_projects(db):
+        projects_by_client.setdefault(project.client_id, []).append(project)
+    tasks_by_project = {}
+    for task in fetch_tasks(db):
+        tasks_by_project.setdefault(task.project_id, []).append(task)
+    payments_by_project = {}
+    for payment in fetch_payments(db):
+        payments_by_project.setdefault(payment.project_id, []).append(payment)
+
     for client in clients:
         click.echo(f"\n--- CLIENT: {client.name} (ID: {client.id}) ---")
         client_details = [
@@ -409,7 +521,7 @@ def comprehensive_report():
         ]
         click.echo(tabulate(client_details, tablefmt="plain"))
 
-        projects = client.projects
+        projects = projects_by_client.get(client.id, [])
         if not projects:
             click.echo("  No projects for this client.")
             continue
@@ -418,7 +530,7 @@ def comprehensive_report():
         project_headers = ["Project ID", "Name", "Deadline", "Priority", "Status", "Progress (%)"]
         project_data = []
         for project in projects:
-            progress = f"{project.get_progress_percentage():.2f}"
+            progress = f"{project.progress:.2f}"
             project_data.append([
                 project.id,
                 project.name,
@@ -431,7 +543,7 @@ def comprehensive_report():
 
         for project in projects:
             click.echo(f"\n    Tasks for Project '{project.name}' (ID: {project.id}):")
-            tasks = project.tasks
+            tasks = tasks_by_project.get(project.id, [])
             if not tasks:
                 click.echo("      No tasks for this project.")
             else:
@@ -447,7 +559,7 @@ def comprehensive_report():
                 click.echo(tabulate(task_data, headers=task_headers, tablefmt="plain", numalign="left"))
 
             click.echo(f"\n    Payments for Project '{project.name}' (ID: {project.id}):")
-            payments = project.payments
+            payments = payments_by_project.get(project.id, [])
             if not payments:
                 click.echo("      No payments for this project.")
             else:
@@ -456,7 +568,7 @@ def comprehensive_report():
                 for payment in payments:
                     payment_data.append([
                         payment.id,
-                        f"${payment.amount:.2f}",
+                        payment.display_amount,
                         payment.payment_type,
                         payment.date.strftime('%Y-%m-%d'),
                         payment.notes[:60] + "..." if len(payment.notes) > 60 else payment.notes
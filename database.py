@@ -5,8 +5,13 @@ from models import Base # Import Base from models.py
 
 DATABASE_URL = "sqlite:///freelance_tracker.db"
 
+# Connection pool shared by all sessions; `cli.py serve` runs up to
+# POOL_SIZE worker threads, each checking out one connection per request.
+POOL_SIZE = 8
+MAX_OVERFLOW = 4
+
 # Create a SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW)
 
 # Create a configured "Session" class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,134 @@
+# lookup.py
+"""
+Resolves client and project names to IDs for the `--client` / `--project`
+options.
+
+A name is looked up case-insensitively through the lower(name) expression
+indexes (ix_clients_name_lower, ix_projects_name_lower), so resolution costs
+one index probe rather than a table scan. Matching follows SQLite's lower(),
+which only folds ASCII letters: 'ACME' finds 'Acme', but 'CAFÉ' does not find
+'Café' (it is offered as a suggestion instead).
+
+Successful lookups are remembered in a small JSON file next to the database,
+which is deleted whenever a Client or Project row is inserted, renamed or
+deleted through the ORM. A cache hit costs a single primary-key read that
+confirms the cached row still exists under that name, so rows renamed or
+deleted behind the ORM's back fall through to the index probe; a duplicate
+name inserted with raw SQL is only noticed once the cache is invalidated.
+On a miss, close matches are offered as suggestions.
+"""
+import difflib
+import json
+import os
+import tempfile
+
+from sqlalchemy import select, func, event, inspect
+from sqlalchemy.orm import Session
+
+from database import engine
+from models import Client, Project
+
+# e.g. freelance_tracker.db -> freelance_tracker.names.json
+NAME_CACHE_FILE = os.path.splitext(engine.url.database or 'freelance_tracker')[0] + '.names.json'
+MAX_SUGGESTIONS = 3
+
+
+class NameNotFound(LookupError):
+    """No row has the given name; carries close matches as suggestions."""
+
+    def __init__(self, kind, name, suggestions):
+        message = f"No {kind} named '{name}'."
+        if suggestions:
+            message += " Did you mean: " + ", ".join(f"'{s}'" for s in suggestions) + "?"
+        super().__init__(message)
+        self.suggestions = suggestions
+
+
+class AmbiguousName(LookupError):
+    """Several rows share the given name (project names are not unique)."""
+
+    def __init__(self, kind, name, ids):
+        super().__init__(
+            f"{len(ids)} {kind}s are named '{name}' (IDs {', '.join(map(str, ids))}); use an ID instead."
+        )
+        self.ids = ids
+
+
+# Folds A-Z only, like SQLite's built-in lower()
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+# --- On-disk cache ---
+def _cache_key(name):
+    return name.strip().translate(_ASCII_LOWER)
+
+def _load_cache():
+    try:
+        with open(NAME_CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache):
+    # Write to a temp file and rename so readers never see a partial file
+    directory = os.path.dirname(os.path.abspath(NAME_CACHE_FILE))
+    try:
+        with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False) as f:
+            json.dump(cache, f)
+        os.replace(f.name, NAME_CACHE_FILE)
+    except OSError:
+        pass  # The cache is only an optimization
+
+def invalidate_cache():
+    """Deletes the name cache file."""
+    try:
+        os.remove(NAME_CACHE_FILE)
+    except FileNotFoundError:
+        pass
+
+@event.listens_for(Client, 'after_insert')
+@event.listens_for(Client, 'after_delete')
+@event.listens_for(Project, 'after_insert')
+@event.listens_for(Project, 'after_delete')
+def _invalidate_on_write(mapper, connection, target):
+    invalidate_cache()
+
+@event.listens_for(Client, 'after_update')
+@event.listens_for(Project, 'after_update')
+def _invalidate_on_rename(mapper, connection, target):
+    # Status and other column updates leave the name -> id mapping intact
+    if inspect(target).attrs.name.history.has_changes():
+        invalidate_cache()
+
+
+# --- Resolution ---
+def _resolve(db: Session, model, kind, name):
+    key = _cache_key(name)
+    cache = _load_cache()
+    cached_id = cache.get(kind, {}).get(key)
+    if cached_id is not None:
+        # Primary-key read: the cached row must still carry this name
+        current = db.execute(select(model.name).where(model.id == cached_id)).scalar()
+        if current is not None and _cache_key(current) == key:
+            return cached_id
+
+    matches_name = func.lower(model.name) == func.lower(name.strip())
+    ids = db.execute(select(model.id).where(matches_name)).scalars().all()
+    if len(ids) > 1:
+        raise AmbiguousName(kind, name, ids)
+    if not ids:
+        names = db.execute(select(model.name)).scalars().all()
+        by_key = {_cache_key(n): n for n in names}
+        matches = difflib.get_close_matches(key, list(by_key), n=MAX_SUGGESTIONS)
+        raise NameNotFound(kind, name, [by_key[m] for m in matches])
+
+    cache.setdefault(kind, {})[key] = ids[0]
+    _save_cache(cache)
+    return ids[0]
+
+def resolve_client_id(db: Session, name):
+    """Returns the ID of the client called `name` (case-insensitive)."""
+    return _resolve(db, Client, 'client', name)
+
+def resolve_project_id(db: Session, name):
+    """Returns the ID of the project called `name` (case-insensitive)."""
+    return _resolve(db, Project, 'project', name)
@@ -0,0 +1,127 @@
+# migration_helpers.py
+"""
+Helpers for Alembic migrations that rewrite large tables.
+
+`backfill()` runs an UPDATE in id-range chunks. Each chunk is committed
+together with a checkpoint row in CHECKPOINT_TABLE, so a migration that is
+interrupted (Ctrl+C, crash, killed process) picks up after the last committed
+chunk when `alembic upgrade` is run again. The checkpoint is removed in the
+same transaction that stamps the new revision.
+
+Because a resumed migration starts from the top of upgrade(), schema steps
+that run before a backfill must tolerate having already been applied; guard
+column additions with `column_exists()` and index drops with
+`op.drop_index(..., if_exists=True)`.
+
+Usage inside a migration:
+
+    from migration_helpers import backfill, column_exists
+
+    def upgrade() -> None:
+        if not column_exists('payments', 'amount_cents'):
+            op.add_column('payments', sa.Column('amount_cents', sa.Integer()))
+        backfill('payments', "amount_cents = CAST(round(amount * 100) AS INTEGER)",
+                 name='b71f0e8d3c26_amount_cents')
+"""
+import logging
+import time
+
+import sqlalchemy as sa
+from alembic import op
+
+# Excluded from autogenerate in alembic/env.py
+CHECKPOINT_TABLE = 'alembic_backfill_checkpoints'
+DEFAULT_CHUNK_SIZE = 50000
+
+logger = logging.getLogger('alembic.backfill')
+
+
+def column_exists(table, column):
+    """
+    True if `table` already has `column` (for re-runnable migrations).
+    Nothing can be inspected in offline (--sql) mode, so it returns False.
+    """
+    if op.get_context().as_sql:
+        return False
+    inspector = sa.inspect(op.get_bind())
+    return any(c['name'] == column for c in inspector.get_columns(table))
+
+
+def _ensure_checkpoint_table(conn):
+    conn.execute(sa.text(
+        f"CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} ("
+        "name VARCHAR PRIMARY KEY, "
+        "table_name VARCHAR NOT NULL, "
+        "last_id INTEGER NOT NULL, "
+        "updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+    ))
+
+
+def _load_checkpoint(conn, name):
+    return conn.execute(
+        sa.text(f"SELECT last_id FROM {CHECKPOINT_TABLE} WHERE name = :name"),
+        {"name": name},
+    ).scalar()
+
+
+def backfill(table, assignments, name, where=None, chunk_size=DEFAULT_CHUNK_SIZE, id_column='id'):
+    """
+    Runs `UPDATE <table> SET <assignments> [WHERE <where>]` in chunks of
+    `chunk_size` ids, committing each chunk with its checkpoint and logging
+    progress. `name` identifies the checkpoint and must be unique per backfill.
+    In offline (--sql) mode a single UPDATE statement is emitted instead.
+    """
+    sql = f"UPDATE {table} SET {assignments}"
+    context = op.get_context()
+    if context.as_sql:
+        op.execute(sql + (f" WHERE {where}" if where else ""))
+        return
+
+    range_sql = f" WHERE {id_column} >= :low AND {id_column} <= :high"
+    if where:
+        range_sql += f" AND ({where})"
+
+    with context.autocommit_block():
+        conn = op.get_bind()
+        _ensure_checkpoint_table(conn)
+        min_id, max_id = conn.execute(
+            sa.text(f"SELECT min({id_column}), max({id_column}) FROM {table}")
+        ).one()
+        if min_id is None:
+            logger.info("Backfill %s: %s is empty, nothing to do.", name, table)
+        else:
+            last_id = _load_checkpoint(conn, name)
+            start = min_id if last_id is None else last_id + 1
+            if last_id is not None:
+                logger.info("Backfill %s: resuming after %s id %d.", name, table, last_id)
+
+            total = max_id - min_id + 1
+            started_at = time.perf_counter()
+            while start <= max_id:
+                high = min(start + chunk_size - 1, max_id)
+                # AUTOCOMMIT leaves the driver outside a transaction, so the
+                # chunk and its checkpoint are grouped explicitly.
+                conn.execute(sa.text("BEGIN"))
+                try:
+                    conn.execute(sa.text(sql + range_sql), {"low": start, "high": high})
+                    conn.execute(sa.text(
+                        f"INSERT INTO {CHECKPOINT_TABLE} (name, table_name, last_id, updated_at) "
+                        "VALUES (:name, :table, :last_id, CURRENT_TIMESTAMP) "
+                        "ON CONFLICT(name) DO UPDATE SET last_id = excluded.last_id, "
+                        "updated_at = excluded.updated_at"
+                    ), {"name": name, "table": table, "last_id": high})
+                    conn.execute(sa.text("COMMIT"))
+                except BaseException:
+                    if conn.connection.dbapi_connection.in_transaction:
+                        conn.execute(sa.text("ROLLBACK"))
+                    raise
+
+                done = high - min_id + 1
+                elapsed = time.perf_counter() - started_at
+                logger.info("Backfill %s: %s ids %d-%d committed (%.1f%%, %.1fs elapsed).",
+                            name, table, start, high, 100.0 * done / total, elapsed)
+                start = high + 1
+
+    # Dropped in the same transaction that stamps the revision, so an
+    # interruption after the last chunk still resumes cleanly.
+    op.execute(sa.text(f"DELETE FROM {CHECKPOINT_TABLE} WHERE name = :name").bindparams(name=name))
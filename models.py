@@ -1,12 +1,53 @@
 # models.py
-from sqlalchemy import create_engine, Column, Integer, String, Text, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index, func
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import sessionmaker, relationship, validates
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
 
 # Base class for our declarative models
 Base = declarative_base()
 
+# Sortable rank for the free-text priority column (lower sorts first).
+PRIORITY_RANKS = {'high': 1, 'medium': 2, 'low': 3}
+UNKNOWN_PRIORITY_RANK = 4
+
+def priority_rank(priority):
+    """Maps a priority string such as 'High' to its sortable rank."""
+    if not priority:
+        return UNKNOWN_PRIORITY_RANK
+    return PRIORITY_RANKS.get(priority.strip().lower(), UNKNOWN_PRIORITY_RANK)
+
+# Money is stored as integer minor units (cents) so sums are exact in SQL.
+DEFAULT_CURRENCY = 'USD'
+CENTS = Decimal('0.01')
+MAX_CENTS = 2 ** 63 - 1  # Largest value a SQLite INTEGER column can hold
+
+def to_cents(amount):
+    """Converts an amount such as '12.345' or 12.5 to integer cents (half-up); raises ValueError if out of range."""
+    cents = int((Decimal(str(amount)) / CENTS).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+    if abs(cents) > MAX_CENTS:
+        raise ValueError(f"'{amount}' is too large to store.")
+    return cents
+
+def from_cents(cents):
+    """Converts integer cents back to an exact Decimal amount."""
+    return (Decimal(cents or 0) * CENTS).quantize(CENTS)
+
+def normalize_currency(code):
+    """Upper-cases a three-letter ISO 4217 code; raises ValueError otherwise."""
+    code = (code or '').strip().upper()
+    if len(code) != 3 or not code.isalpha():
+        raise ValueError(f"'{code}' is not a three-letter currency code.")
+    return code
+
+def format_money(cents, currency=DEFAULT_CURRENCY):
+    """Formats cents for display, e.g. '$12.50' or '12.50 EUR'."""
+    amount = from_cents(cents)
+    if currency == DEFAULT_CURRENCY:
+        return f"${amount}"
+    return f"{amount} {currency}"
+
 class Client(Base):
     """
     Represents a client in the freelance project tracker.
@@ -23,6 +64,11 @@ class Client(Base):
     # One-to-many relationship with Project
     projects = relationship("Project", back_populates="client", cascade="all, delete-orphan")
 
+    # Case-insensitive name lookups for --client (see lookup.py)
+    __table_args__ = (
+        Index('ix_clients_name_lower', func.lower(name)),
+    )
+
     def __repr__(self):
         return f"<Client(id={self.id}, name='{self.name}')>"
 
@@ -38,6 +84,7 @@ class Project(Base):
     description = Column(Text)
     deadline = Column(DateTime)
     priority = Column(String, default='Medium') # e.g., High, Medium, Low
+    priority_rank = Column(Integer, default=PRIORITY_RANKS['medium']) # Kept in sync with priority
     status = Column(String, default='Pending') # e.g., Pending, In Progress, Completed, On Hold
 
     # Foreign key to Client
@@ -48,6 +95,22 @@ class Project(Base):
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
     payments = relationship("Payment", back_populates="project", cascade="all, delete-orphan")
 
+    # Partial index over open, dated projects in scheduling order; serves the
+    # `due` command so it reads only the rows it returns.
+    __table_args__ = (
+        Index(
+            'ix_projects_due', 'deadline', 'priority_rank',
+            sqlite_where=(status != 'Completed') & (deadline.isnot(None)),
+        ),
+        # Case-insensitive name lookups for --project (see lookup.py)
+        Index('ix_projects_name_lower', func.lower(name)),
+    )
+
+    @validates('priority')
+    def _sync_priority_rank(self, key, value):
+        self.priority_rank = priority_rank(value)
+        return value
+
     def __repr__(self):
         return f"<Project(id={self.id}, name='{self.name}', client='{self.client.name if self.client else 'N/A'}')>"
 
@@ -72,7 +135,7 @@ class Task(Base):
     completed_at = Column(DateTime)
 
     # Foreign key to Project
-    project_id = Column(Integer, ForeignKey('projects.id'))
+    project_id = Column(Integer, ForeignKey('projects.id'), index=True)
     project = relationship("Project", back_populates="tasks")
 
     def __repr__(self):
@@ -86,7 +149,8 @@ class Payment(Base):
     __tablename__ = 'payments'
 
     id = Column(Integer, primary_key=True)
-    amount = Column(Float, nullable=False)
+    amount_cents = Column(Integer, nullable=False) # Amount in minor units (cents)
+    currency = Column(String(3), nullable=False, default=DEFAULT_CURRENCY) # ISO 4217 code
     payment_type = Column(String, nullable=False) # e.g., 'Invoice', 'Received', 'Pending'
     date = Column(DateTime, default=datetime.now)
     notes = Column(Text)
@@ -95,5 +159,15 @@ class Payment(Base):
     project_id = Column(Integer, ForeignKey('projects.id'))
     project = relationship("Project", back_populates="payments")
 
+    # Covers per-project totals so SUM(amount_cents) never touches the table.
+    __table_args__ = (
+        Index('ix_payments_totals', 'project_id', 'currency', 'payment_type', 'amount_cents'),
+    )
+
+    @property
+    def amount(self):
+        """Exact Decimal amount derived from amount_cents."""
+        return from_cents(self.amount_cents)
+
     def __repr__(self):
-        return f"<Payment(id={self.id}, amount={self.amount}, type='{self.payment_type}')>"
+        return f"<Payment(id={self.id}, amount={self.amount}, currency='{self.currency}', type='{self.payment_type}')>"
@@ -0,0 +1,240 @@
+# queries.py
+from typing import NamedTuple, Optional
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, func, or_
+from sqlalchemy.orm import Session
+
+from models import Client, Project, Task, Payment, from_cents, format_money
+
+WINDOW_UNITS = {'h': 'hours', 'd': 'days', 'w': 'weeks'}
+
+def parse_window(value):
+    """Turns a window such as '7d', '12h' or '2w' into a timedelta; raises ValueError."""
+    if not value:
+        return None
+    unit = WINDOW_UNITS.get(value[-1].lower())
+    if unit is None or not value[:-1].isdigit():
+        raise ValueError(f"'{value}' is not a window such as 7d, 12h or 2w.")
+    return timedelta(**{unit: int(value[:-1])})
+
+# Read-only row records.
+# The list, search, report and export commands only ever print a handful of
+# columns, so they select exactly those columns and get back plain tuples
+# instead of full ORM instances (no identity map, no relationship proxies).
+
+class ClientRow(NamedTuple):
+    id: int
+    name: str
+    contact_person: Optional[str]
+    email: Optional[str]
+    phone: Optional[str]
+
+class ProjectRow(NamedTuple):
+    id: int
+    name: str
+    client_id: Optional[int]
+    client_name: Optional[str]
+    description: Optional[str]
+    deadline: Optional[datetime]
+    priority: Optional[str]
+    status: Optional[str]
+    total_tasks: int
+    completed_tasks: int
+
+    @property
+    def progress(self):
+        """Completion percentage, matching Project.get_progress_percentage()."""
+        if self.total_tasks == 0:
+            return 0
+        return (self.completed_tasks / self.total_tasks) * 100
+
+class DueProjectRow(NamedTuple):
+    id: int
+    name: str
+    client_name: Optional[str]
+    deadline: datetime
+    priority: Optional[str]
+    status: Optional[str]
+    remaining_tasks: int
+
+    def is_overdue(self, now=None):
+        """True if the deadline day is before today; a project due today is not overdue."""
+        return self.deadline.date() < (now or datetime.now()).date()
+
+class TaskRow(NamedTuple):
+    id: int
+    project_id: Optional[int]
+    project_name: Optional[str]
+    description: str
+    is_completed: Optional[bool]
+    created_at: Optional[datetime]
+    completed_at: Optional[datetime]
+
+class PaymentRow(NamedTuple):
+    id: int
+    project_id: Optional[int]
+    project_name: Optional[str]
+    amount_cents: int
+    currency: str
+    payment_type: str
+    date: Optional[datetime]
+    notes: Optional[str]
+
+    @property
+    def amount(self):
+        """Exact Decimal amount derived from amount_cents."""
+        return from_cents(self.amount_cents)
+
+    @property
+    def display_amount(self):
+        return format_money(self.amount_cents, self.currency)
+
+class PaymentTotalRow(NamedTuple):
+    currency: str
+    payment_type: str
+    count: int
+    total_cents: int
+
+    @property
+    def display_total(self):
+        return format_money(self.total_cents, self.currency)
+
+
+def _task_counts():
+    """
+    Correlated (total, completed) task counts, evaluated per selected project
+    through ix_tasks_project_id rather than by grouping the whole tasks table.
+    """
+    total = (
+        select(func.count(Task.id))
+        .where(Task.project_id == Project.id)
+        .correlate(Project)
+        .scalar_subquery()
+    )
+    completed = (
+        select(func.count(Task.id))
+        .where(Task.project_id == Project.id)
+        .where(Task.is_completed.is_(True))
+        .correlate(Project)
+        .scalar_subquery()
+    )
+    return total, completed
+
+
+def fetch_clients(db: Session, search_term=None, order_by_name=False):
+    """Returns ClientRow records, optionally filtered by a LIKE pattern."""
+    stmt = select(
+        Client.id, Client.name, Client.contact_person, Client.email, Client.phone
+    )
+    if search_term is not None:
+        stmt = stmt.where(or_(
+            Client.name.like(search_term),
+            Client.contact_person.like(search_term),
+            Client.email.like(search_term),
+            Client.phone.like(search_term),
+        ))
+    stmt = stmt.order_by(Client.name if order_by_name else Client.id)
+    return [ClientRow._make(r) for r in db.execute(stmt)]
+
+
+def fetch_projects(db: Session, client_id=None, project_id=None, search_term=None):
+    """Returns ProjectRow records with task counts computed in SQL."""
+    total_tasks, completed_tasks = _task_counts()
+    stmt = (
+        select(
+            Project.id, Project.name, Project.client_id, Client.name,
+            Project.description, Project.deadline, Project.priority, Project.status,
+            total_tasks, completed_tasks,
+        )
+        .outerjoin(Client, Project.client_id == Client.id)
+    )
+    if client_id:
+        stmt = stmt.where(Project.client_id == client_id)
+    if project_id:
+        stmt = stmt.where(Project.id == project_id)
+    if search_term is not None:
+        stmt = stmt.where(or_(
+            Project.name.like(search_term),
+            Project.description.like(search_term),
+        ))
+    stmt = stmt.order_by(Project.id)
+    return [ProjectRow._make(r) for r in db.execute(stmt)]
+
+
+def fetch_due_projects(db: Session, limit=10, due_before=None):
+    """
+    Returns the next `limit` open projects ordered by deadline, then priority.
+    The filter mirrors the partial index ix_projects_due so SQLite walks the
+    index in order and stops after `limit` rows; remaining task counts are
+    probed per returned project through ix_tasks_project_id.
+    """
+    remaining = (
+        select(func.count(Task.id))
+        .where(Task.project_id == Project.id)
+        .where(Task.is_completed.isnot(True))
+        .correlate(Project)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            Project.id, Project.name, Client.name, Project.deadline,
+            Project.priority, Project.status, remaining,
+        )
+        .outerjoin(Client, Project.client_id == Client.id)
+        .where(Project.status != 'Completed')
+        .where(Project.deadline.isnot(None))
+    )
+    if due_before is not None:
+        stmt = stmt.where(Project.deadline <= due_before)
+    stmt = stmt.order_by(Project.deadline, Project.priority_rank).limit(limit)
+    return [DueProjectRow._make(r) for r in db.execute(stmt)]
+
+
+def fetch_tasks(db: Session, project_id=None, search_term=None):
+    """Returns TaskRow records joined with their project name."""
+    stmt = (
+        select(
+            Task.id, Task.project_id, Project.name, Task.description,
+            Task.is_completed, Task.created_at, Task.completed_at,
+        )
+        .outerjoin(Project, Task.project_id == Project.id)
+    )
+    if project_id:
+        stmt = stmt.where(Task.project_id == project_id)
+    if search_term is not None:
+        stmt = stmt.where(Task.description.like(search_term))
+    stmt = stmt.order_by(Task.id)
+    return [TaskRow._make(r) for r in db.execute(stmt)]
+
+
+def fetch_payments(db: Session, project_id=None, search_term=None):
+    """Returns PaymentRow records joined with their project name."""
+    stmt = (
+        select(
+            Payment.id, Payment.project_id, Project.name, Payment.amount_cents,
+            Payment.currency, Payment.payment_type, Payment.date, Payment.notes,
+        )
+        .outerjoin(Project, Payment.project_id == Project.id)
+    )
+    if project_id:
+        stmt = stmt.where(Payment.project_id == project_id)
+    if search_term is not None:
+        stmt = stmt.where(Payment.notes.like(search_term))
+    stmt = stmt.order_by(Payment.id)
+    return [PaymentRow._make(r) for r in db.execute(stmt)]
+
+
+def fetch_payment_totals(db: Session, project_id=None):
+    """
+    Returns exact per-currency, per-type payment totals summed as integers in
+    SQL; with a project filter this is answered from ix_payments_totals alone.
+    """
+    stmt = select(
+        Payment.currency, Payment.payment_type,
+        func.count(Payment.id), func.coalesce(func.sum(Payment.amount_cents), 0),
+    )
+    if project_id:
+        stmt = stmt.where(Payment.project_id == project_id)
+    stmt = stmt.group_by(Payment.currency, Payment.payment_type).order_by(Payment.currency, Payment.payment_type)
+    return [PaymentTotalRow._make(r) for r in db.execute(stmt)]